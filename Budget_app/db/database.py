@@ -12,7 +12,10 @@
 # so that rounding errors never corrupt money values.
 
 from pathlib import Path
+import atexit
 import sqlite3
+from calendar import monthrange
+from collections import namedtuple
 from datetime import date, timedelta
 
 # -------------------------------------------------------------------
@@ -53,13 +56,98 @@ CREATE TABLE IF NOT EXISTS recurring_rules(
   note TEXT DEFAULT '',
   every_n INTEGER NOT NULL,         -- how often it repeats (e.g., 2)
   unit TEXT NOT NULL,               -- unit of repetition: 'day', 'week', or 'month'
-  last_generated_date TEXT          -- remembers how far ahead we’ve generated
+  last_generated_date TEXT,         -- date of the last occurrence generated
+  generated_until TEXT              -- horizon the rule has been expanded to
 );
 """
 
+# Bump this whenever migrate_if_needed() learns a new step. It is stored in
+# PRAGMA user_version, so an up-to-date database skips migration entirely.
+SCHEMA_VERSION = 3
+
 # Keep one connection open for performance
 _conn = None
 
+# Lightweight row type for list_by_date(): plain tuples are cheaper to build
+# than sqlite3.Row wrappers, and fields stay readable (txn.amount_cents).
+Txn = namedtuple("Txn", "id date amount_cents note rule_id")
+
+# Hot-path SQL lives in module constants so every call passes the *same*
+# string object and always hits sqlite3's per-connection statement cache.
+_SQL_INSERT_TXN = (
+    "INSERT INTO transactions(date, amount_cents, note, rule_id) VALUES (?,?,?,?) "
+    "ON CONFLICT(date, amount_cents, note, rule_id) DO UPDATE SET note=excluded.note "
+    "RETURNING id"
+)
+_SQL_INSERT_TXN_OR_IGNORE = (
+    "INSERT OR IGNORE INTO transactions(date, amount_cents, note, rule_id) VALUES (?,?,?,?)"
+)
+_SQL_LIST_BY_DATE = (
+    "SELECT id, date, amount_cents, note, rule_id "
+    "FROM transactions WHERE date = ? ORDER BY id DESC"
+)
+_SQL_GET_TXN = "SELECT id, date, amount_cents, note, rule_id FROM transactions WHERE id=?"
+_SQL_BAL = "SELECT COALESCE(SUM(amount_cents),0) AS bal FROM transactions WHERE date<=?"
+# Opening balance + per-day totals in one scan: every row before :first
+# lands in a single NULL-keyed group, later rows are grouped per date.
+# Pinned to the covering index so it stays an index-only scan (the plain
+# idx_txn_date would need a table lookup per row for amount_cents).
+_SQL_MONTH_TOTALS = """
+SELECT CASE WHEN date < :first THEN NULL ELSE date END AS day,
+       SUM(amount_cents) AS total
+FROM transactions INDEXED BY idx_txn_date_amount
+WHERE date <= :last
+GROUP BY day
+"""
+
+# Day/week recurrences have a fixed stride, so SQLite can expand them itself:
+# ?1 first date, ?2 date modifier (e.g. '+14 days'), ?3 horizon,
+# ?4 amount_cents, ?5 note, ?6 rule_id.
+_SQL_GENERATE_STEPPED = """
+WITH RECURSIVE occ(d) AS (
+    SELECT ?1
+    UNION ALL
+    SELECT date(d, ?2) FROM occ WHERE date(d, ?2) <= ?3
+)
+INSERT OR IGNORE INTO transactions(date, amount_cents, note, rule_id)
+SELECT d, ?4, ?5, ?6 FROM occ
+"""
+
+# The same expansion for *every* day/week rule behind :horizon at once.
+# `first` is the next occurrence to create: last_generated_date plus one
+# stride (`step` days), or start_date for a rule that has never been expanded.
+_SQL_STEPPED_RULES_DUE = """
+SELECT id, amount_cents, note, step,
+       COALESCE(date(last_generated_date, '+' || step || ' days'), start_date) AS first
+FROM (SELECT *, every_n * (CASE unit WHEN 'week' THEN 7 ELSE 1 END) AS step
+      FROM recurring_rules
+      WHERE unit IN ('day', 'week')
+        AND (generated_until IS NULL OR generated_until < :horizon))
+"""
+_SQL_GENERATE_ALL_STEPPED = f"""
+WITH RECURSIVE occ(d, step, amt, note, rule_id) AS (
+    SELECT first, step, amount_cents, note, id
+    FROM ({_SQL_STEPPED_RULES_DUE}) WHERE first <= :horizon
+    UNION ALL
+    SELECT date(d, '+' || step || ' days'), step, amt, note, rule_id
+    FROM occ WHERE date(d, '+' || step || ' days') <= :horizon
+)
+INSERT OR IGNORE INTO transactions(date, amount_cents, note, rule_id)
+SELECT d, amt, note, rule_id FROM occ
+"""
+# Run after the INSERT above: last occurrence on or before :horizon is
+# first + floor(days_between / step) * step; rules with nothing new keep theirs.
+_SQL_MARK_ALL_STEPPED = f"""
+UPDATE recurring_rules SET
+    last_generated_date = CASE WHEN due.first <= :horizon
+        THEN date(due.first, '+' || (CAST(julianday(:horizon) - julianday(due.first) AS INTEGER)
+                                     / due.step * due.step) || ' days')
+        ELSE recurring_rules.last_generated_date END,
+    generated_until = :horizon
+FROM ({_SQL_STEPPED_RULES_DUE}) AS due
+WHERE recurring_rules.id = due.id
+"""
+
 # -------------------------------------------------------------------
 # 3. Database connection helpers
 # -------------------------------------------------------------------
@@ -71,7 +159,8 @@ def get_conn() -> sqlite3.Connection:
     """
     global _conn
     if _conn is None:
-        _conn = sqlite3.connect(DB_PATH)
+        # Room for every hot statement plus the one-off ones (default is 128)
+        _conn = sqlite3.connect(DB_PATH, cached_statements=256)
         _conn.row_factory = sqlite3.Row  # allows row["column"] access
         # Performance + reliability tweaks
         _conn.execute("PRAGMA foreign_keys = ON")
@@ -80,17 +169,42 @@ def get_conn() -> sqlite3.Connection:
         _conn.execute("PRAGMA synchronous = NORMAL")
         _conn.execute("PRAGMA temp_store = MEMORY")
         _conn.execute("PRAGMA cache_size = -4000")       # ~4MB memory cache
+        # read pages straight from the OS page cache (256MB window)
+        _conn.execute("PRAGMA mmap_size = 268435456")
         # wait 3s if DB is locked
         _conn.execute("PRAGMA busy_timeout = 3000")
     return _conn
 
 
+def _close_conn() -> None:
+    """
+    Refresh the query planner statistics and close the cached connection.
+    Registered with atexit so it runs once when the app shuts down.
+    """
+    global _conn
+    if _conn is None:
+        return
+    try:
+        _conn.execute("PRAGMA optimize")
+    finally:
+        _conn.close()
+        _conn = None
+
+
+atexit.register(_close_conn)
+
+
 def migrate_if_needed():
     """
     Run schema creation and upgrades.
-    This function is safe to call every time the app starts.
+    This function is safe to call every time the app starts: when the
+    stored user_version already matches SCHEMA_VERSION it returns after
+    a single PRAGMA read.
     """
     conn = get_conn()
+    if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        return
+
     with conn:
         conn.executescript(SCHEMA_BASE)
 
@@ -100,12 +214,38 @@ def migrate_if_needed():
         if "rule_id" not in cols:
             conn.execute("ALTER TABLE transactions ADD COLUMN rule_id INTEGER")
 
+        # Add missing generated_until column (per-rule expansion horizon)
+        cols = [r["name"]
+                for r in conn.execute("PRAGMA table_info('recurring_rules')")]
+        if "generated_until" not in cols:
+            conn.execute(
+                "ALTER TABLE recurring_rules ADD COLUMN generated_until TEXT")
+
         # Prevent duplicate generated rows
         conn.execute("""
             CREATE UNIQUE INDEX IF NOT EXISTS ux_txn_unique
             ON transactions(date, amount_cents, note, rule_id)
         """)
 
+        # Covering index: SUM(amount_cents) WHERE date<=? is answered
+        # from the index alone, without visiting the table rows
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_txn_date_amount
+            ON transactions(date, amount_cents)
+        """)
+
+        # Rule lookups (delete a series, "has this rule generated rows?")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_txn_rule
+            ON transactions(rule_id)
+        """)
+
+        # Give the planner fresh statistics for the new indexes; after this
+        # the PRAGMA optimize run on close keeps them current.
+        conn.execute("ANALYZE")
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
 # -------------------------------------------------------------------
 # 4. Transactions API
 # -------------------------------------------------------------------
@@ -115,24 +255,37 @@ def insert_txn(date_str: str, cents: int, note: str = "", rule_id=None) -> int:
     """
     Insert a transaction. If it’s part of a recurring series, include rule_id.
     Returns the transaction’s id.
+
+    If an identical row already exists (ux_txn_unique), the no-op upsert
+    makes RETURNING hand back the existing id in the same statement,
+    so no follow-up SELECT is needed. Requires SQLite 3.35+.
     """
     conn = get_conn()
     with conn:
-        cur = conn.execute(
-            "INSERT OR IGNORE INTO transactions(date, amount_cents, note, rule_id) VALUES (?,?,?,?)",
-            (date_str, cents, note, rule_id),
-        )
-        if cur.lastrowid:  # successful insert
-            return cur.lastrowid
-
-        # If a duplicate already exists, return its id
         row = conn.execute(
-            "SELECT id FROM transactions WHERE date=? AND amount_cents=? AND note=? AND (rule_id IS ? OR rule_id=?)",
-            (date_str, cents, note, rule_id, rule_id),
-        ).fetchone()
+            _SQL_INSERT_TXN, (date_str, cents, note, rule_id)).fetchone()
         return row["id"]
 
 
+def _insert_rows(conn: sqlite3.Connection, rows) -> None:
+    """
+    executemany() the given (date, cents, note, rule_id) tuples.
+    The caller owns the transaction, so this can join a bigger write.
+    """
+    conn.cursor().executemany(_SQL_INSERT_TXN_OR_IGNORE, rows)
+
+
+def insert_txns(rows) -> None:
+    """
+    Bulk-insert many transactions in ONE transaction (one commit total).
+    `rows` is an iterable of (date_str, cents, note, rule_id) tuples;
+    exact duplicates of existing rows are ignored.
+    """
+    conn = get_conn()
+    with conn:
+        _insert_rows(conn, rows)
+
+
 def update_txn(txn_id: int, date_str: str, cents: int, note: str = "") -> None:
     """Update an existing transaction by id."""
     conn = get_conn()
@@ -151,33 +304,46 @@ def delete_txn(txn_id: int) -> None:
 
 
 def list_by_date(day_iso: str):
-    """Get all transactions for a single date."""
-    conn = get_conn()
-    return conn.execute(
-        "SELECT id, date, amount_cents, note, rule_id "
-        "FROM transactions WHERE date = ? ORDER BY id DESC",
-        (day_iso,),
-    ).fetchall()
+    """
+    Get all transactions for a single date as a list of Txn namedtuples.
+    Uses a cursor without the sqlite3.Row factory so rows arrive as tuples.
+    """
+    cur = get_conn().cursor()
+    cur.row_factory = None
+    return list(map(Txn._make, cur.execute(_SQL_LIST_BY_DATE, (day_iso,))))
 
 
 def get_txn(txn_id: int):
     """Get a single transaction by id."""
     conn = get_conn()
-    return conn.execute(
-        "SELECT id, date, amount_cents, note, rule_id FROM transactions WHERE id=?",
-        (txn_id,),
-    ).fetchone()
+    return conn.execute(_SQL_GET_TXN, (txn_id,)).fetchone()
 
 
 def balance_on_or_before(day_iso: str) -> int:
     """Get the total balance up to and including the given date."""
     conn = get_conn()
-    row = conn.execute(
-        "SELECT COALESCE(SUM(amount_cents),0) AS bal FROM transactions WHERE date<=?",
-        (day_iso,),
-    ).fetchone()
+    row = conn.execute(_SQL_BAL, (day_iso,)).fetchone()
     return row["bal"]
 
+
+def month_totals(year: int, month: int):
+    """
+    Return (opening_cents, day_totals) for one calendar month:
+    the balance just before the 1st, and a flat list of each day's net
+    total (day_totals[0] is the 1st; days without transactions are 0).
+    One query instead of a prefix SUM + a GROUP BY.
+    """
+    n_days = monthrange(year, month)[1]
+    prefix = f"{year:04d}-{month:02d}-"
+    opening, totals = 0, [0] * n_days
+    for day, total in get_conn().execute(
+            _SQL_MONTH_TOTALS, {"first": prefix + "01", "last": f"{prefix}{n_days:02d}"}):
+        if day is None:
+            opening = total
+        else:
+            totals[int(day[8:10]) - 1] = total
+    return opening, totals
+
 # -------------------------------------------------------------------
 # 5. Recurring rules
 # -------------------------------------------------------------------
@@ -186,22 +352,30 @@ def balance_on_or_before(day_iso: str) -> int:
 # The app generates transactions up to a “horizon” (e.g., 12 months ahead).
 
 
+def _insert_rule(conn: sqlite3.Connection, start_date: str, amount_cents: int,
+                 note: str, every_n: int, unit: str) -> int:
+    """INSERT one recurring rule on `conn` and return its id (no commit)."""
+    assert unit in ("day", "week", "month")
+    cur = conn.execute(
+        "INSERT INTO recurring_rules(start_date, amount_cents, note, every_n, unit, last_generated_date) "
+        "VALUES (?,?,?,?,?,NULL)",
+        (start_date, amount_cents, note, every_n, unit),
+    )
+    return cur.lastrowid
+
+
 def create_rule(start_date: str, amount_cents: int, note: str, every_n: int, unit: str) -> int:
     """Create a recurring rule and return its id."""
-    assert unit in ("day", "week", "month")
     conn = get_conn()
     with conn:
-        cur = conn.execute(
-            "INSERT INTO recurring_rules(start_date, amount_cents, note, every_n, unit, last_generated_date) "
-            "VALUES (?,?,?,?,?,NULL)",
-            (start_date, amount_cents, note, every_n, unit),
-        )
-        return cur.lastrowid
+        return _insert_rule(conn, start_date, amount_cents, note, every_n, unit)
 
 
 def rules_all():
     """Return all recurring rules in the database."""
-    return get_conn().execute("SELECT * FROM recurring_rules ORDER BY id").fetchall()
+    return get_conn().execute(
+        "SELECT id, start_date, amount_cents, note, every_n, unit, last_generated_date "
+        "FROM recurring_rules ORDER BY id").fetchall()
 
 
 def delete_rule_and_txns(rule_id: int):
@@ -218,8 +392,7 @@ def _add_months(d: date, months: int) -> date:
     """Add N months to a date (clamps the day to end-of-month if needed)."""
     y = d.year + (d.month - 1 + months) // 12
     m = (d.month - 1 + months) % 12 + 1
-    last_day = [31, 29 if (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)) else 28,
-                31, 30, 31, 30, 31, 31, 30, 31, 30, 31][m - 1]
+    last_day = monthrange(y, m)[1]
     return date(y, m, min(d.day, last_day))
 
 
@@ -234,37 +407,137 @@ def _advance(d: date, every_n: int, unit: str) -> date:
     raise ValueError("invalid unit")
 
 
+def _month_occurrence_dates(cur: date, horizon: date, every_n: int) -> list:
+    """
+    Return ISO strings for every monthly occurrence from `cur` up to
+    `horizon`, stepping every_n months at a time.
+
+    Works on plain ints instead of date objects: the month is a single
+    counter (year*12 + month-1) advanced by every_n, and the day is clamped
+    to monthrange()'s month length as in _add_months(). The clamped day
+    carries forward, exactly like chaining _add_months() (Jan 31 -> Feb 28
+    -> Mar 28).
+    """
+    mon = cur.year * 12 + cur.month - 1
+    day = cur.day
+    end_mon = horizon.year * 12 + horizon.month - 1
+    dates = []
+    while mon <= end_mon:
+        y, m0 = divmod(mon, 12)
+        day = min(day, monthrange(y, m0 + 1)[1])
+        if mon == end_mon and day > horizon.day:
+            break
+        dates.append(f"{y:04d}-{m0 + 1:02d}-{day:02d}")
+        mon += every_n
+    return dates
+
+
 def generate_until(rule_id: int, until_date: str) -> None:
     """
     Generate transactions for a recurring rule until the given horizon.
     Uses INSERT OR IGNORE + UNIQUE index to avoid duplicates.
+
+    Day/week rules are expanded inside SQLite by one recursive CTE.
+    Monthly rules are expanded in Python, because SQLite's '+N months'
+    overflows into the next month (Jan 31 -> Mar 3) instead of clamping
+    like _add_months(); those rows go through a single executemany().
+    Either way everything is written in one transaction.
     """
     conn = get_conn()
-    r = conn.execute("SELECT * FROM recurring_rules WHERE id=?",
-                     (rule_id,)).fetchone()
+    r = conn.execute(
+        "SELECT start_date, amount_cents, note, every_n, unit, last_generated_date "
+        "FROM recurring_rules WHERE id=?",
+        (rule_id,)).fetchone()
     if not r:
         return
 
-    start = date.fromisoformat(r["start_date"])
-    every_n, unit = r["every_n"], r["unit"]
-    amt, note = r["amount_cents"], r["note"]
-    horizon = date.fromisoformat(until_date)
+    with conn:
+        _generate_until_impl(conn, rule_id, *r, until_date)
+
+
+def create_rule_and_generate(start_date: str, amount_cents: int, note: str,
+                             every_n: int, unit: str, until_date: str) -> int:
+    """
+    Save a new recurring rule in ONE transaction (one commit total):
+    create the rule, adopt a matching manual row on its start date
+    (see coalesce_manual_start_into_rule), and generate its occurrences
+    up to until_date. Returns the new rule id.
+    """
+    conn = get_conn()
+    with conn:
+        rule_id = _insert_rule(
+            conn, start_date, amount_cents, note, every_n, unit)
+        _coalesce_impl(conn, rule_id, start_date, amount_cents, note)
+        _generate_until_impl(conn, rule_id, start_date, amount_cents,
+                             note, every_n, unit, None, until_date)
+    return rule_id
 
-    cur = start if not r["last_generated_date"] else _advance(
-        date.fromisoformat(r["last_generated_date"]), every_n, unit)
 
-    last_created = None
-    while cur <= horizon:
-        insert_txn(cur.isoformat(), amt, note, rule_id=rule_id)
-        last_created = cur
-        cur = _advance(cur, every_n, unit)
+def generate_all_until(until_date: str) -> int:
+    """
+    Extend every recurring rule to the given horizon in ONE transaction.
+    Rules whose generated_until already reaches the horizon are skipped by
+    the SELECT itself, so a refresh with nothing to do costs one query.
+    Returns how many rules were extended (0 means nothing was written).
 
-    if last_created is not None:
-        with conn:
-            conn.execute(
-                "UPDATE recurring_rules SET last_generated_date=? WHERE id=?",
-                (last_created.isoformat(), rule_id),
-            )
+    All day/week rules are expanded together by one recursive-CTE INSERT
+    plus one UPDATE; only monthly rules are expanded per rule in Python.
+    """
+    conn = get_conn()
+    rules = conn.execute(
+        "SELECT id, start_date, amount_cents, note, every_n, unit, last_generated_date "
+        "FROM recurring_rules WHERE generated_until IS NULL OR generated_until < ?",
+        (until_date,)).fetchall()
+    if not rules:
+        return 0
+
+    params = {"horizon": until_date}
+    with conn:
+        if any(r["unit"] != "month" for r in rules):
+            conn.execute(_SQL_GENERATE_ALL_STEPPED, params)
+            conn.execute(_SQL_MARK_ALL_STEPPED, params)
+        for r in rules:
+            if r["unit"] == "month":
+                _generate_until_impl(conn, *r, until_date)
+    return len(rules)
+
+
+def _generate_until_impl(conn, rule_id, start_iso, amt, note, every_n, unit,
+                         last_gen, until_date) -> None:
+    """
+    Shared body of the generate_* functions. Writes through `conn` but does
+    not commit: the caller wraps it in `with conn:`.
+    """
+    horizon = date.fromisoformat(until_date)
+
+    cur = date.fromisoformat(start_iso) if not last_gen else _advance(
+        date.fromisoformat(last_gen), every_n, unit)
+
+    last_iso = last_gen
+    if cur <= horizon:
+        if unit in ("day", "week"):
+            step = every_n if unit == "day" else 7 * every_n
+            conn.execute(_SQL_GENERATE_STEPPED, (
+                cur.isoformat(), f"+{step} days", until_date, amt, note, rule_id))
+            # Last occurrence on or before the horizon, computed directly
+            last_iso = (cur + timedelta(
+                days=(horizon - cur).days // step * step)).isoformat()
+        else:
+            rows = [(iso, amt, note, rule_id)
+                    for iso in _month_occurrence_dates(cur, horizon, every_n)]
+            _insert_rows(conn, rows)
+            last_iso = rows[-1][0]
+
+    # Remember the horizon even when nothing new fell inside it, so the
+    # next generate_all_until() to the same horizon skips this rule.
+    # (generated_until only ever moves forward.)
+    conn.execute(
+        "UPDATE recurring_rules SET last_generated_date=?1, "
+        "generated_until=CASE WHEN generated_until IS NULL OR generated_until < ?2 "
+        "THEN ?2 ELSE generated_until END "
+        "WHERE id=?3",
+        (last_iso, until_date, rule_id),
+    )
 
 
 def coalesce_manual_start_into_rule(rule_id: int) -> None:
@@ -276,33 +549,42 @@ def coalesce_manual_start_into_rule(rule_id: int) -> None:
     so that only one copy remains.
     """
     conn = get_conn()
-    r = conn.execute("SELECT * FROM recurring_rules WHERE id=?",
-                     (rule_id,)).fetchone()
+    r = conn.execute(
+        "SELECT start_date, amount_cents, note FROM recurring_rules WHERE id=?",
+        (rule_id,)).fetchone()
     if not r:
         return
 
-    start = r["start_date"]
-    amt = r["amount_cents"]
-    note = r["note"]
-
-    # Look for a manual transaction on the same start date
-    manual = conn.execute(
-        "SELECT id FROM transactions WHERE date=? AND amount_cents=? AND note=? AND rule_id IS NULL LIMIT 1",
-        (start, amt, note),
-    ).fetchone()
-    if not manual:
-        return
-
-    # If we already generated one, delete manual duplicate
-    generated = conn.execute(
-        "SELECT id FROM transactions WHERE date=? AND amount_cents=? AND note=? AND rule_id=? LIMIT 1",
-        (start, amt, note, rule_id),
-    ).fetchone()
-
     with conn:
-        if generated:
-            conn.execute("DELETE FROM transactions WHERE id=?",
-                         (manual["id"],))
-        else:
-            conn.execute(
-                "UPDATE transactions SET rule_id=? WHERE id=?", (rule_id, manual["id"]))
+        _coalesce_impl(conn, rule_id, *r)
+
+
+def _coalesce_impl(conn: sqlite3.Connection, rule_id: int, start_iso: str,
+                   amt: int, note: str) -> None:
+    """Body of coalesce_manual_start_into_rule(); runs on `conn`, no commit."""
+    params = {"start": start_iso, "amt": amt,
+              "note": note, "rule_id": rule_id}
+
+    # Both statements target the same "first manual row on the start date".
+    # DELETE runs first: if a generated copy already exists, the manual
+    # duplicate goes away. Otherwise the UPDATE adopts the manual row into
+    # the rule. (Run the other way round, the UPDATE would create the
+    # "generated copy" that the DELETE then matches.)
+    conn.execute("""
+        DELETE FROM transactions
+        WHERE id = (SELECT id FROM transactions
+                    WHERE date=:start AND amount_cents=:amt AND note=:note
+                      AND rule_id IS NULL LIMIT 1)
+          AND EXISTS (SELECT 1 FROM transactions
+                      WHERE date=:start AND amount_cents=:amt AND note=:note
+                        AND rule_id=:rule_id)
+    """, params)
+    conn.execute("""
+        UPDATE transactions SET rule_id=:rule_id
+        WHERE id = (SELECT id FROM transactions
+                    WHERE date=:start AND amount_cents=:amt AND note=:note
+                      AND rule_id IS NULL LIMIT 1)
+          AND NOT EXISTS (SELECT 1 FROM transactions
+                          WHERE date=:start AND amount_cents=:amt AND note=:note
+                            AND rule_id=:rule_id)
+    """, params)
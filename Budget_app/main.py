@@ -24,20 +24,29 @@
 # HOW RECURRENCE WORKS (high level)
 # - When you create a rule (e.g., "every 2 weeks"), the app generates
 #   future occurrences up to a *horizon* (configurable months ahead).
-# - Each time we render a month, we extend all rules out to (current
-#   month + horizon), using a UNIQUE index to avoid duplicates.
+# - Each time we render a month, we extend all rules just past it
+#   (current month + a small eager window); the full horizon is filled
+#   in shortly after startup. A UNIQUE index avoids duplicates.
 # - Deleting: you can delete a single occurrence or the entire rule.
 
 
-from datetime import date, datetime, timedelta
+from collections import OrderedDict
+from datetime import date
 import calendar
-from functools import partial
+from functools import lru_cache
+from itertools import accumulate
 
+from kivy.clock import Clock
+from kivy.graphics import Color, RoundedRectangle
 from kivy.lang import Builder
-from kivy.uix.widget import Widget
+from kivy.metrics import dp, sp
+from kivy.properties import NumericProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.modalview import ModalView
+from kivy.uix.stacklayout import StackLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 
 from kivymd.app import MDApp
-from kivymd.uix.dialog import MDDialog
 from kivymd.uix.button import MDRectangleFlatButton
 from kivymd.uix.textfield import MDTextField
 from kivymd.uix.pickers import MDDatePicker
@@ -45,16 +54,15 @@ from kivymd.uix.selectioncontrol import MDSwitch
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.toast import toast
 from kivymd.uix.list import OneLineListItem
-from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
 
 # Data layer: see db/database.py for definitions
 from db.database import (
     migrate_if_needed,
     insert_txn, update_txn, delete_txn,
-    get_txn, list_by_date, balance_on_or_before, get_conn,
-    create_rule, generate_until, rules_all, delete_rule_and_txns,
-    coalesce_manual_start_into_rule,
+    get_txn, list_by_date, balance_on_or_before, month_totals,
+    create_rule_and_generate, generate_all_until,
+    delete_rule_and_txns,
 )
 
 
@@ -65,20 +73,57 @@ from db.database import (
 # (12 = generate a full year ahead. Increase to 24/36 if you prefer.)
 AHEAD_N_MONTHS = 12
 
-# A tiny cache: the farthest date (ISO) we've already generated up to.
-# This prevents re-running generate_until(...) on every small refresh.
-_generated_until_iso = None
+# Rendering a month only needs rules extended a little past it, so the grid
+# refresh generates this many months ahead; the rest of AHEAD_N_MONTHS is
+# filled in once, FULL_HORIZON_DELAY seconds after startup.
+EAGER_AHEAD_N_MONTHS = 2
+FULL_HORIZON_DELAY = 2.0
+
+# Month navigation repaints only after the chevrons have been quiet this
+# long (seconds), so fast clicking renders just the month you land on.
+NAV_REFRESH_DELAY = 0.05
+
+# Month aggregates kept in memory (least recently used dropped first), so
+# paging back and forth between months skips the SQL.
+MONTH_CACHE_SIZE = 24
+
+# Text colors for money: green for >= 0, red for negative. Shared tuples so
+# each repaint reuses them instead of building fresh ones per label.
+COLOR_POS = (0, 0.6, 0, 1)
+COLOR_NEG = (0.8, 0, 0, 1)
 
 
 # -------------------------------------------------------------
 # SMALL, REUSABLE HELPERS
 # -------------------------------------------------------------
+# Day-card metrics, converted to pixels once instead of parsing "56dp" etc.
+# for each of the 42 cards on every repaint
+_CARD_H = dp(56)
+_CARD_PAD = dp(6)
+_DAY_LBL_H = dp(14)
+_BAL_FONT = sp(12)
+
+# Month names/abbreviations indexed 1..12 (index 0 is ""), resolved once at import
+_MONTH_NAMES = tuple(calendar.month_name)
+_MONTH_ABBR = tuple(calendar.month_abbr)
+
+# Two-digit cents strings "00".."99", indexed instead of formatted per call
+_CENTS = tuple(f"{i:02d}" for i in range(100))
+
+
+@lru_cache(maxsize=256)
 def format_money(cents: int) -> str:
-    """Return dollars-and-cents string for an integer cent value."""
+    """
+    Return dollars-and-cents string for an integer cent value. Memoized:
+    a month grid repeats the same running balance on every quiet day.
+    """
     sign = "-" if cents < 0 else ""
     n = abs(cents)
     dollars, c = divmod(n, 100)
-    return f"{sign}${dollars:,}.{c:02d}"
+    if dollars < 1000:
+        # No thousands separator needed: skip the grouping format path
+        return f"{sign}${dollars}.{_CENTS[c]}"
+    return f"{sign}${dollars:,}.{_CENTS[c]}"
 
 
 def notify(msg: str) -> None:
@@ -89,8 +134,9 @@ def notify(msg: str) -> None:
         print(f"[NOTICE] {msg}")
 
 
+@lru_cache(maxsize=64)
 def end_of_month(y: int, m: int) -> date:
-    """Return the last date of the given (year, month)."""
+    """Return the last date of the given (year, month). Memoized."""
     return date(y, m, calendar.monthrange(y, m)[1])
 
 
@@ -105,6 +151,104 @@ def add_months(y: int, m: int, k: int):
     return Y, M
 
 
+def full_horizon_iso() -> str:
+    """
+    ISO date of the end of (this month + AHEAD_N_MONTHS). Counted from
+    today, not from the month on screen, so navigation never moves it.
+    """
+    today = date.today()
+    y, m = add_months(today.year, today.month, AHEAD_N_MONTHS)
+    return end_of_month(y, m).isoformat()
+
+
+# -------------------------------------------------------------
+# TRANSACTION LIST ROW (recycled)
+# -------------------------------------------------------------
+class TxnRow(RecycleDataViewBehavior, OneLineListItem):
+    """
+    One row of the transaction list. The RecycleView only creates enough
+    of these to fill the screen; RecycleDataViewBehavior copies each
+    `data` dict ({"text", "text_color", "txn_id"}) onto a row as it is
+    (re)used.
+    """
+
+    txn_id = NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.theme_text_color = "Custom"
+
+    def on_release(self):
+        """Open the edit dialog for whichever transaction this row shows now."""
+        MDApp.get_running_app()._open_edit_dialog(int(self.txn_id))
+
+
+# -------------------------------------------------------------
+# DAY CELL (pooled in the month grid)
+# -------------------------------------------------------------
+class DayCell(BoxLayout):
+    """
+    One day of the month grid: a plain BoxLayout over a light rounded
+    rectangle. Used instead of MDCard so the 42 cells carry no ripple or
+    elevation machinery (ripple draws through the stencil buffer).
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        with self.canvas.before:
+            Color(.96, .96, .96, 1)
+            self._bg = RoundedRectangle(pos=self.pos, size=self.size, radius=[10])
+        self.bind(pos=self._sync_bg, size=self._sync_bg)
+
+    def _sync_bg(self, *_):
+        """Keep the background rectangle on top of the cell's box."""
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+
+
+# -------------------------------------------------------------
+# FORM DIALOG (add / edit)
+# -------------------------------------------------------------
+class FormDialog(ModalView):
+    """
+    Lightweight replacement for MDDialog(type="custom"): a title, the form
+    widget (`content_cls`, same name as MDDialog) and a wrapping row of
+    buttons on a plain ModalView with a white rounded background. No
+    Material elevation/shadow; built once and reopened.
+    """
+
+    def __init__(self, title: str, content_cls, buttons, **kwargs):
+        kwargs.setdefault("size_hint", (0.9, None))
+        super().__init__(**kwargs)
+        self.background_color = (0, 0, 0, 0)  # hide the stock image; we draw our own
+        self.content_cls = content_cls
+
+        box = BoxLayout(orientation="vertical", padding=dp(16), spacing=dp(8),
+                        size_hint_y=None)
+        with box.canvas.before:
+            Color(1, 1, 1, 1)
+            bg = RoundedRectangle(radius=[dp(8)])
+
+        def _sync_bg(*_):
+            bg.pos, bg.size = box.pos, box.size
+
+        box.bind(pos=_sync_bg, size=_sync_bg,
+                 minimum_height=box.setter("height"))
+
+        box.add_widget(MDLabel(text=title, font_style="H6",
+                               size_hint_y=None, height=dp(36)))
+        box.add_widget(content_cls)
+
+        row = StackLayout(orientation="rl-tb", spacing=dp(8), size_hint_y=None)
+        row.bind(minimum_height=row.setter("height"))
+        for btn in reversed(buttons):  # "rl" fills right to left
+            row.add_widget(btn)
+        box.add_widget(row)
+
+        self.add_widget(box)
+        box.bind(height=self.setter("height"))
+
+
 # -------------------------------------------------------------
 # KV LAYOUT
 # -------------------------------------------------------------
@@ -113,7 +257,7 @@ def add_months(y: int, m: int, k: int):
 # - Banner Label (shows selected day's ending balance)
 # - Weekday header (Mon..Sun)
 # - Month grid (7 columns; we populate it from Python)
-# - Scrollable transaction list
+# - Scrollable transaction list (RecycleView of TxnRow)
 # - Floating action button ("+")
 KV = """
 Screen:
@@ -174,9 +318,15 @@ Screen:
             size_hint_y: None
             height: self.minimum_height
 
-        ScrollView:
-            MDList:
-                id: txn_list
+        RecycleView:
+            id: txn_list
+            viewclass: "TxnRow"
+            RecycleBoxLayout:
+                default_size: None, dp(48)
+                default_size_hint: 1, None
+                size_hint_y: None
+                height: self.minimum_height
+                orientation: "vertical"
 
         MDFloatingActionButton:
             icon: "plus"
@@ -210,9 +360,34 @@ class EasyBudgetApp(MDApp):
 
         root = Builder.load_string(KV)
 
+        # Create the 6x7 pool of day cards once; refresh_month_grid only
+        # updates their labels/visibility instead of rebuilding widgets.
+        self._day_cards = self._build_day_cards(root.ids.month_grid)
+        # One touch handler for the whole grid (instead of one per card)
+        root.ids.month_grid.bind(on_touch_up=self._on_grid_touch_up)
+
         today = date.today()
         self.current_year, self.current_month = today.year, today.month
-        self._selected_iso = today.isoformat()
+        self.selected_iso = today.isoformat()
+
+        # Pending debounced month-navigation refresh (see _schedule_refresh)
+        self._nav_refresh_ev = None
+
+        # Pending next-frame grid repaint after edits (see _request_grid_refresh)
+        self._grid_refresh_ev = None
+
+        # Banner balances by ISO date; valid for one _txn_version only
+        # (see _data_changed), so re-tapping a day is a dict lookup.
+        self._balance_cache = {}
+        self._txn_version = 0
+
+        # month_totals() results keyed by (year, month, _txn_version); an
+        # OrderedDict so the oldest entry can be evicted past MONTH_CACHE_SIZE.
+        self._month_cache = OrderedDict()
+
+        # Edit dialogs, built on first use and keyed by is_recur
+        # (see _open_edit_dialog)
+        self._edit_dialogs = {}
 
         return root
 
@@ -221,32 +396,71 @@ class EasyBudgetApp(MDApp):
         Called when the window appears.
         We immediately render:
         - Top bar title (current month/year),
-        - Banner (ending balance for selected day),
-        - Month grid (with running balances).
+        - Month grid (with running balances),
+        - Banner (ending balance for selected day; read from the grid's balances).
         """
         self.refresh_month_title()
-        self.refresh_today()
-        self.refresh_month_grid()
+        self._refresh_all()
+
+        # The first paint only generated a couple of months ahead; extend
+        # to the full horizon once the window is up and idle.
+        Clock.schedule_once(self._extend_to_full_horizon, FULL_HORIZON_DELAY)
+
+    # ----- Selected day -----
+    @property
+    def selected_iso(self) -> str:
+        """The selected date as an ISO string (used for DB queries)."""
+        return self._selected_iso
+
+    @selected_iso.setter
+    def selected_iso(self, value: str):
+        """Set the selection; the parsed `date` is cached alongside it."""
+        self._selected_iso = value
+        self._selected_date = date.fromisoformat(value)
 
     # ----- Month navigation (chevrons in the top bar) -----
     def prev_month(self):
-        """Move the calendar view one month backward and refresh the UI."""
-        y, m = self.current_year, self.current_month
-        y, m = (y - 1, 12) if m == 1 else (y, m - 1)
+        """Move the calendar view one month backward and schedule a repaint."""
+        y, m = add_months(self.current_year, self.current_month, -1)
         self.current_year, self.current_month = y, m
-        self._selected_iso = date(y, m, 1).isoformat()
+        self.selected_iso = date(y, m, 1).isoformat()
         self.refresh_month_title()
-        self.refresh_today()
-        self.refresh_month_grid()
+        self._schedule_refresh()
 
     def next_month(self):
-        """Move the calendar view one month forward and refresh the UI."""
-        y, m = self.current_year, self.current_month
-        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        """Move the calendar view one month forward and schedule a repaint."""
+        y, m = add_months(self.current_year, self.current_month, 1)
         self.current_year, self.current_month = y, m
-        self._selected_iso = date(y, m, 1).isoformat()
+        self.selected_iso = date(y, m, 1).isoformat()
         self.refresh_month_title()
-        self.refresh_today()
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        """
+        (Re)start the short navigation timer. Month state and the title update
+        immediately; the banner/list/grid repaint runs once, when the clicks stop.
+        """
+        if self._nav_refresh_ev is not None:
+            self._nav_refresh_ev.cancel()
+        self._nav_refresh_ev = Clock.schedule_once(
+            self._do_nav_refresh, NAV_REFRESH_DELAY)
+
+    def _do_nav_refresh(self, _dt):
+        """Clock callback: repaint for the month we finally landed on."""
+        self._nav_refresh_ev = None
+        self._refresh_all()
+
+    def _request_grid_refresh(self):
+        """
+        Repaint the month grid on the next frame. Several writes in a row
+        (e.g. save then delete) schedule only one repaint between them.
+        """
+        if self._grid_refresh_ev is None:
+            self._grid_refresh_ev = Clock.schedule_once(self._do_grid_refresh, 0)
+
+    def _do_grid_refresh(self, _dt):
+        """Clock callback for _request_grid_refresh."""
+        self._grid_refresh_ev = None
         self.refresh_month_grid()
 
     # -------------------------------------------------------------
@@ -254,82 +468,51 @@ class EasyBudgetApp(MDApp):
     # -------------------------------------------------------------
     def open_add_dialog(self):
         """
-        Build and show the "Add transaction" dialog.
-        The dialog contains:
-        - Amount field (float text)
-        - Note field
-        - Date button (opens a date picker)
-        - Repeat toggle: if ON, shows "Every [N] [unit]"
+        Show the "Add transaction" dialog, reset to a blank form.
+        The dialog is built once (see _build_add_dialog) and reused.
         """
+        if not hasattr(self, "_dialog"):
+            self._build_add_dialog()
+
         # Initial state defaults: selected day, repeat OFF
-        self._tx_date = date.fromisoformat(self._selected_iso)
+        self._tx_date = self._selected_date
         self._repeat_on, self._repeat_every, self._repeat_unit = False, 2, "week"
 
-        # Content (Kivy widgets) constructed from KV snippet
-        content = Builder.load_string("""
-BoxLayout:
-    orientation: "vertical"
-    spacing: "10dp"
-    padding: "8dp"
-    size_hint_y: None
-    height: "220dp"
-
-    MDTextField:
-        id: amount
-        hint_text: "Amount (e.g., -15.00 or 1700)"
-        input_filter: "float"
-    MDTextField:
-        id: note
-        hint_text: "Description / Note"
+        # Clear whatever the previous use left behind. Turning the switch
+        # off first lets _on_repeat disable the "Every N" controls.
+        self._repeat_switch.active = False
+        self._amount_field.text = ""
+        self._note_field.text = ""
+        self._every_field.text = ""
+        self._unit_btn.text = self._repeat_unit
+        self._add_date_btn.text = self._tx_date.isoformat()
 
-    BoxLayout:
-        size_hint_y: None
-        height: "42dp"
-        spacing: "8dp"
-        MDLabel:
-            text: "Repeat"
-            halign: "left"
-            valign: "center"
-        MDSwitch:
-            id: repeat_switch
+        self._dialog.open()
 
-    BoxLayout:
-        size_hint_y: None
-        height: "42dp"
-        spacing: "8dp"
-        MDTextField:
-            id: every_n
-            hint_text: "Every"
-            input_filter: "int"
-            text: ""
-            helper_text: "Number"
-            helper_text_mode: "on_focus"
-            disabled: True
-            size_hint_x: 0.35
-        MDRectangleFlatButton:
-            id: unit_btn
-            text: "week"
-            disabled: True
-            size_hint_x: 0.45
-""")
+    def _build_add_dialog(self):
+        """
+        Build the "Add transaction" dialog once.
+        The dialog contains:
+        - Amount field (float text)
+        - Note field
+        - Date button (opens a date picker)
+        - Repeat toggle: if ON, shows "Every [N] [unit]"
+        """
+        content = self._make_add_dialog_content()
 
         # Date selector button shows the current date;
-        # Clicking it opens MDDatePicker; saving updates the label.
-        date_btn = MDRectangleFlatButton(
-            text=self._tx_date.isoformat(),
-            on_release=lambda *_: MDDatePicker(
-                year=self._tx_date.year, month=self._tx_date.month, day=self._tx_date.day,
-                on_save=self._on_add_date_saved
-            ).open()
+        # Clicking it opens the date picker; saving updates the label.
+        self._add_date_btn = MDRectangleFlatButton(
+            on_release=lambda *_: self._open_date_picker(
+                self._tx_date, self._on_add_date_saved)
         )
 
         # The dialog has three buttons: date selector, Cancel, Save
-        self._dialog = MDDialog(
+        self._dialog = FormDialog(
             title="Add transaction",
-            type="custom",
             content_cls=content,
             buttons=[
-                date_btn,
+                self._add_date_btn,
                 MDRectangleFlatButton(
                     text="Cancel", on_release=lambda *_: self._dialog.dismiss()),
                 MDRectangleFlatButton(
@@ -337,15 +520,7 @@ BoxLayout:
             ],
         )
 
-        # Field references for use in _save_new_txn()
-        self._amount_field = content.ids.amount
-        self._note_field = content.ids.note
-        self._every_field = content.ids.every_n
-        self._unit_btn = content.ids.unit_btn
-
         # Toggle logic: when Repeat is ON, enable "Every N" controls
-        sw = content.ids.repeat_switch
-
         def _on_repeat(_inst, value):
             self._repeat_on = bool(value)
             self._every_field.disabled = not value
@@ -354,7 +529,7 @@ BoxLayout:
                 self._every_field.text = str(self._repeat_every)
                 self._unit_btn.text = self._repeat_unit
 
-        sw.bind(active=_on_repeat)
+        self._repeat_switch.bind(active=_on_repeat)
 
         # Menu to choose the unit (day/week/month)
         menu_items = [
@@ -366,7 +541,51 @@ BoxLayout:
             caller=self._unit_btn, items=menu_items, width_mult=3)
         self._unit_btn.bind(on_release=lambda *_: self._unit_menu.open())
 
-        self._dialog.open()
+    def _make_add_dialog_content(self):
+        """
+        Assemble the add dialog's form widgets directly in Python (no KV
+        parsing) and keep references to the fields used by open_add_dialog()
+        and _save_new_txn().
+        """
+        content = BoxLayout(orientation="vertical", spacing="10dp", padding="8dp",
+                            size_hint_y=None, height="220dp")
+
+        self._amount_field = MDTextField(
+            hint_text="Amount (e.g., -15.00 or 1700)", input_filter="float")
+        self._note_field = MDTextField(hint_text="Description / Note")
+        content.add_widget(self._amount_field)
+        content.add_widget(self._note_field)
+
+        # "Repeat [switch]"
+        repeat_row = BoxLayout(size_hint_y=None, height="42dp", spacing="8dp")
+        repeat_row.add_widget(
+            MDLabel(text="Repeat", halign="left", valign="center"))
+        self._repeat_switch = MDSwitch()
+        repeat_row.add_widget(self._repeat_switch)
+        content.add_widget(repeat_row)
+
+        # "Every [N] [unit]" (enabled only while Repeat is on)
+        every_row = BoxLayout(size_hint_y=None, height="42dp", spacing="8dp")
+        self._every_field = MDTextField(
+            hint_text="Every", input_filter="int", text="",
+            helper_text="Number", helper_text_mode="on_focus",
+            disabled=True, size_hint_x=0.35)
+        self._unit_btn = MDRectangleFlatButton(
+            text="week", disabled=True, size_hint_x=0.45)
+        every_row.add_widget(self._every_field)
+        every_row.add_widget(self._unit_btn)
+        content.add_widget(every_row)
+
+        return content
+
+    def _open_date_picker(self, d: date, on_save):
+        """
+        Open an MDDatePicker preset to `d`. Saving calls
+        `on_save(picker, selected_date, ...)`. A fresh picker is built per
+        open so the preset only goes through MDDatePicker's constructor.
+        """
+        MDDatePicker(year=d.year, month=d.month, day=d.day,
+                     on_save=on_save).open()
 
     def _set_unit(self, unit: str):
         """Update the unit button text and internal value when a unit is chosen."""
@@ -380,9 +599,7 @@ BoxLayout:
         reflect it in the date button’s label.
         """
         self._tx_date = selected_date
-        for b in self._dialog.buttons:
-            if isinstance(b, MDRectangleFlatButton) and b.text.count("-") == 2:
-                b.text = selected_date.isoformat()
+        self._add_date_btn.text = selected_date.isoformat()
 
     def _save_new_txn(self):
         """
@@ -408,23 +625,18 @@ BoxLayout:
                 every_n = max(1, int(n_txt))
                 unit = self._repeat_unit
 
-                # Create the recurrence recipe
-                rule_id = create_rule(
-                    self._tx_date.isoformat(), cents, note, every_n, unit)
-
-                # If the user had already inserted a manual row for that start date,
-                # merge it into the rule to avoid duplicate first occurrence.
-                coalesce_manual_start_into_rule(rule_id)
-
-                # Generate far ahead: end of (current month + AHEAD_N_MONTHS)
-                horizon_y, horizon_m = add_months(
-                    self.current_year, self.current_month, AHEAD_N_MONTHS)
-                horizon = end_of_month(horizon_y, horizon_m).isoformat()
-                generate_until(rule_id, horizon)
+                # One transaction: create the recurrence recipe, merge a manual
+                # row the user already entered on the start date (avoids a
+                # duplicate first occurrence), and generate the occurrences
+                # out to the full horizon (counted from today).
+                create_rule_and_generate(
+                    self._tx_date.isoformat(), cents, note, every_n, unit,
+                    full_horizon_iso())
 
             else:
                 # Simple one-off transaction
                 insert_txn(self._tx_date.isoformat(), cents, note)
+            self._data_changed()
 
         except Exception as e:
             notify(f"Error: {e}")
@@ -434,10 +646,10 @@ BoxLayout:
                 self._dialog.dismiss()
 
         # Select the saved date and refresh relevant views
-        self._selected_iso = self._tx_date.isoformat()
+        self.selected_iso = self._tx_date.isoformat()
+        if self._selected_in_current_month():
+            self._request_grid_refresh()
         self.refresh_today()
-        if self._date_in_current_month(self._selected_iso):
-            self.refresh_month_grid()
         notify("Saved")
 
     # -------------------------------------------------------------
@@ -448,6 +660,7 @@ BoxLayout:
         Open a dialog to edit a transaction.
         If the row belongs to a recurring rule:
           - show buttons to delete ONLY THIS occurrence or the ENTIRE series.
+        The two dialog variants are built once each and reused.
         """
         row = get_txn(txn_id)
         if not row:
@@ -455,33 +668,36 @@ BoxLayout:
             return
 
         self._edit_txn_id = txn_id
-        self._edit_date = datetime.fromisoformat(row["date"]).date()
+        self._edit_rule_id = row["rule_id"]
+        self._edit_date = date.fromisoformat(row["date"])
         is_recur = row["rule_id"] is not None
 
-        content = Builder.load_string("""
-BoxLayout:
-    orientation: "vertical"
-    spacing: "8dp"
-    padding: "8dp"
-    size_hint_y: None
-    height: "140dp"
-    MDTextField:
-        id: amount
-        hint_text: "Amount"
-        input_filter: "float"
-    MDTextField:
-        id: note
-        hint_text: "Description / Note"
-""")
-        content.ids.amount.text = f"{row['amount_cents']/100:.2f}"
-        content.ids.note.text = row["note"] or ""
+        if is_recur not in self._edit_dialogs:
+            self._edit_dialogs[is_recur] = self._build_edit_dialog(is_recur)
+        self._edit_dialog = self._edit_dialogs[is_recur]
+
+        content = self._edit_dialog.content_cls
+        content.amount_field.text = f"{row['amount_cents']/100:.2f}"
+        content.note_field.text = row["note"] or ""
+        self._edit_dialog.date_btn.text = row["date"]
+        self._edit_dialog.open()
+
+    def _build_edit_dialog(self, is_recur: bool):
+        """
+        Build one edit dialog variant. Its buttons act on the row currently
+        being edited (self._edit_txn_id / self._edit_rule_id).
+        """
+        # Form widgets built directly in Python (no KV parsing)
+        content = BoxLayout(orientation="vertical", spacing="8dp", padding="8dp",
+                            size_hint_y=None, height="140dp")
+        content.amount_field = MDTextField(hint_text="Amount", input_filter="float")
+        content.note_field = MDTextField(hint_text="Description / Note")
+        content.add_widget(content.amount_field)
+        content.add_widget(content.note_field)
 
         date_btn = MDRectangleFlatButton(
-            text=row["date"],
-            on_release=lambda *_: MDDatePicker(
-                year=self._edit_date.year, month=self._edit_date.month, day=self._edit_date.day,
-                on_save=self._on_edit_date_saved
-            ).open()
+            on_release=lambda *_: self._open_date_picker(
+                self._edit_date, self._on_edit_date_saved)
         )
 
         # Buttons differ if this is a recurring row
@@ -491,7 +707,7 @@ BoxLayout:
                 MDRectangleFlatButton(
                     text="Delete this", on_release=lambda *_: self._delete_this_only(self._edit_txn_id)),
                 MDRectangleFlatButton(
-                    text="Delete series", on_release=lambda *_: self._delete_series(row["rule_id"])),
+                    text="Delete series", on_release=lambda *_: self._delete_series(self._edit_rule_id)),
             ]
         else:
             buttons += [MDRectangleFlatButton(
@@ -500,31 +716,32 @@ BoxLayout:
             MDRectangleFlatButton(
                 text="Cancel", on_release=lambda *_: self._edit_dialog.dismiss()),
             MDRectangleFlatButton(
-                text="Save",   on_release=lambda *_: self._save_edited_txn(content)),
+                text="Save",   on_release=lambda *_: self._save_edited_txn()),
         ]
 
-        self._edit_dialog = MDDialog(
-            title="Edit transaction", type="custom", content_cls=content, buttons=buttons)
-        self._edit_dialog.open()
+        dialog = FormDialog(
+            title="Edit transaction", content_cls=content, buttons=buttons)
+        dialog.date_btn = date_btn
+        return dialog
 
     def _on_edit_date_saved(self, _picker, selected_date, *_):
         """Store the edited date and update the button label inside the dialog."""
         self._edit_date = selected_date
-        for b in self._edit_dialog.buttons:
-            if isinstance(b, MDRectangleFlatButton) and b.text.count("-") == 2:
-                b.text = selected_date.isoformat()
+        self._edit_dialog.date_btn.text = selected_date.isoformat()
 
-    def _save_edited_txn(self, content):
+    def _save_edited_txn(self):
         """Persist changes to an existing transaction (amount, note, date)."""
+        content = self._edit_dialog.content_cls
         try:
-            txt = (content.ids.amount.text or "").strip()
+            txt = (content.amount_field.text or "").strip()
             if not txt:
                 notify("Please enter an amount")
                 return
             cents = int(round(float(txt) * 100))
-            note = (content.ids.note.text or "").strip()
+            note = (content.note_field.text or "").strip()
             update_txn(self._edit_txn_id,
                        self._edit_date.isoformat(), cents, note)
+            self._data_changed()
         except Exception as e:
             notify(f"Error: {e}")
             return
@@ -532,16 +749,17 @@ BoxLayout:
             if hasattr(self, "_edit_dialog"):
                 self._edit_dialog.dismiss()
 
-        self._selected_iso = self._edit_date.isoformat()
+        self.selected_iso = self._edit_date.isoformat()
+        if self._selected_in_current_month():
+            self._request_grid_refresh()
         self.refresh_today()
-        if self._date_in_current_month(self._selected_iso):
-            self.refresh_month_grid()
         notify("Updated")
 
     def _delete_this_only(self, txn_id: int):
         """Delete only this occurrence (for both one-off and recurring rows)."""
         try:
             delete_txn(txn_id)
+            self._data_changed()
         except Exception as e:
             notify(f"Delete failed: {e}")
             return
@@ -549,9 +767,9 @@ BoxLayout:
             if hasattr(self, "_edit_dialog"):
                 self._edit_dialog.dismiss()
 
+        if self._selected_in_current_month():
+            self._request_grid_refresh()
         self.refresh_today()
-        if self._date_in_current_month(self._selected_iso):
-            self.refresh_month_grid()
         notify("Deleted")
 
     def _delete_series(self, rule_id: int):
@@ -561,6 +779,7 @@ BoxLayout:
         """
         try:
             delete_rule_and_txns(rule_id)
+            self._data_changed()
         except Exception as e:
             notify(f"Delete series failed: {e}")
             return
@@ -568,9 +787,9 @@ BoxLayout:
             if hasattr(self, "_edit_dialog"):
                 self._edit_dialog.dismiss()
 
+        if self._selected_in_current_month():
+            self._request_grid_refresh()
         self.refresh_today()
-        if self._date_in_current_month(self._selected_iso):
-            self.refresh_month_grid()
         notify("Series deleted")
 
     def _confirm_delete(self, txn_id: int):
@@ -580,14 +799,74 @@ BoxLayout:
     # -------------------------------------------------------------
     # RENDERING HELPERS
     # -------------------------------------------------------------
-    def _date_in_current_month(self, iso: str) -> bool:
-        """Return True if the given ISO date is in the currently viewed month."""
-        d = datetime.fromisoformat(iso).date()
+    def _refresh_all(self):
+        """
+        Repaint grid, banner and list for the current month in one go.
+        The grid runs first: its month query seeds _balance_cache, so the
+        banner then costs no query and only list_by_date hits the DB.
+        """
+        self.refresh_month_grid()
+        self.refresh_today()
+
+    def _data_changed(self):
+        """
+        Call after anything that may have written transactions: bumps the
+        data version and drops cached balances so the next render re-queries.
+        """
+        self._txn_version += 1
+        self._balance_cache.clear()
+
+    def _build_day_cards(self, grid):
+        """
+        Add 42 day cells (6 weeks x 7 days, enough for any month) to the grid
+        and return them in order. Each card keeps references to its two
+        labels (`day_lbl`, `bal_lbl`) and the ISO date it shows (`iso`).
+        """
+        cards = []
+        for _ in range(42):
+            card = DayCell(
+                orientation="vertical",
+                size_hint_y=None, height=_CARD_H, padding=_CARD_PAD,
+            )
+            # Day number
+            card.day_lbl = MDLabel(
+                font_style="Caption",
+                theme_text_color="Secondary",
+                size_hint_y=None, height=_DAY_LBL_H,
+            )
+            # Ending balance for this day
+            card.bal_lbl = MDLabel(
+                theme_text_color="Custom",
+                font_size=_BAL_FONT,
+            )
+            card.add_widget(card.day_lbl)
+            card.add_widget(card.bal_lbl)
+            card.iso = None
+            grid.add_widget(card)
+            cards.append(card)
+        return cards
+
+    def _on_grid_touch_up(self, grid, touch):
+        """
+        Tapping a visible day card selects that date and refreshes the list.
+        Bound once on the grid; hit-tests the pooled cards itself.
+        """
+        if grid.collide_point(*touch.pos):
+            for card in self._day_cards:
+                if card.iso is not None and card.collide_point(*touch.pos):
+                    self.selected_iso = card.iso
+                    self.refresh_today()
+                    break
+        return False  # don't swallow other events
+
+    def _selected_in_current_month(self) -> bool:
+        """Return True if the selected date is in the currently viewed month."""
+        d = self._selected_date
         return (d.year == self.current_year) and (d.month == self.current_month)
 
     def refresh_month_title(self):
         """Update the top app bar to show 'MonthName Year'."""
-        self.root.ids.topbar.title = f"{calendar.month_name[self.current_month]} {self.current_year}"
+        self.root.ids.topbar.title = f"{_MONTH_NAMES[self.current_month]} {self.current_year}"
 
     def refresh_today(self):
         """
@@ -598,120 +877,130 @@ BoxLayout:
             iso = self._selected_iso
 
             # 1) Banner: ending balance on selected day (sum of all <= date)
-            ending_cents = balance_on_or_before(iso)
-            d = datetime.fromisoformat(iso)
+            ending_cents = self._balance_cache.get(iso)
+            if ending_cents is None:
+                ending_cents = balance_on_or_before(iso)
+                self._balance_cache[iso] = ending_cents
             banner = self.root.ids.banner
-            banner.text = f"Balance on {d.strftime('%b %d')}: {format_money(ending_cents)}"
-            banner.text_color = (
-                0, 0.6, 0, 1) if ending_cents >= 0 else (0.8, 0, 0, 1)
+            d = self._selected_date
+            banner.text = (f"Balance on {_MONTH_ABBR[d.month]} {d.day:02d}: "
+                           f"{format_money(ending_cents)}")
+            banner.text_color = COLOR_POS if ending_cents >= 0 else COLOR_NEG
 
             # 2) Transaction list for that date
+            # Only data dicts are built here; TxnRow widgets are recycled.
             rows = list_by_date(iso)
-            lst = self.root.ids.txn_list
-            lst.clear_widgets()
-
+            data = []
             for r in rows:
-                # sqlite3.Row behaves like a mapping; use key membership (no .get on Row)
-                is_recur = ("rule_id" in r.keys()) and (
-                    r["rule_id"] is not None)
+                # Rows are Txn namedtuples (see db/database.py): use attributes
+                is_recur = r.rule_id is not None
                 prefix = "⟲ " if is_recur else ""
-                text = f"{prefix}{format_money(r['amount_cents'])} — {r['note'] or ''}"
-
-                item = OneLineListItem(text=text)
-                item.theme_text_color = "Custom"
-                item.text_color = (
-                    0, 0.6, 0, 1) if r["amount_cents"] >= 0 else (0.8, 0, 0, 1)
-
-                # Bind the click to open the edit dialog for this row
-                # Use partial to pass the id as the first argument; ignore the widget param
-                item.bind(on_release=partial(
-                    self._open_edit_dialog, int(r["id"])))
-                lst.add_widget(item)
+                data.append({
+                    "text": f"{prefix}{format_money(r.amount_cents)} — {r.note or ''}",
+                    "text_color": COLOR_POS if r.amount_cents >= 0 else COLOR_NEG,
+                    "txn_id": int(r.id),
+                })
+            self.root.ids.txn_list.data = data
 
         except Exception as e:
             notify(f"refresh_today error: {e}")
             import traceback
             traceback.print_exc()
 
-    def refresh_month_grid(self):
+    def _extend_to_full_horizon(self, _dt):
         """
-        (Re)build the visible month grid:
-        - Extend all recurring rules to a far horizon (cached so we don't repeat work).
-        - Compute the running balance and paint each day cell.
-        - Make each day cell tappable: tapping selects that date and refreshes the list.
+        Clock callback (scheduled once from on_start): generate all rules
+        out to the full AHEAD_N_MONTHS horizon, counted from today (see
+        full_horizon_iso), whatever month is on screen. Nothing visible changes,
+        since the grid already has its eager window; this just saves the
+        work from landing on a later month navigation.
         """
-        global _generated_until_iso
+        try:
+            if generate_all_until(full_horizon_iso()):
+                self._data_changed()
+        except Exception as e:
+            notify(f"Horizon error: {e}")
 
+    def refresh_month_grid(self):
+        """
+        Repaint the visible month grid:
+        - Extend all recurring rules a little past this month (rules already there are skipped).
+        - Compute the running balance and write it into the pooled day cards.
+        - Hide the cards before the 1st / after the last day of the month.
+        """
         y, m = self.current_year, self.current_month
         first = date(y, m, 1)
 
-        # 1) Extend all rules to far horizon only if we haven't done so already.
-        far_y, far_m = add_months(y, m, AHEAD_N_MONTHS)
-        far_horizon = end_of_month(far_y, far_m).isoformat()
-        if _generated_until_iso is None or far_horizon > _generated_until_iso:
-            for r in rules_all():
-                generate_until(r["id"], far_horizon)
-            _generated_until_iso = far_horizon
-
-        # 2) Query just what we need to paint the month grid.
-        conn = get_conn()
-        grid = self.root.ids.month_grid
-        grid.clear_widgets()
-
-        # Start the running balance from the day *before* this month begins.
-        running = conn.execute(
-            "SELECT COALESCE(SUM(amount_cents),0) FROM transactions WHERE date <= ?",
-            ((first - timedelta(days=1)).isoformat(),)
-        ).fetchone()[0]
-
+        # 1) Extend all rules to the eager horizon in one transaction. Each
+        #    rule remembers its own horizon in the DB, so rules that are
+        #    already there (the usual case) are filtered out by a single
+        #    SELECT. The full horizon is handled by _extend_to_full_horizon.
+        near_y, near_m = add_months(y, m, EAGER_AHEAD_N_MONTHS)
+        if generate_all_until(end_of_month(near_y, near_m).isoformat()):
+            self._data_changed()
+
+        # 2) One query gives the balance before the 1st (where the running
+        #    balance starts) and each day's total within the month.
+        #    day_totals is a flat per-day list (index 0 = the 1st).
+        #    Cached per data version, so revisiting a month is a dict hit.
         last = end_of_month(y, m)
-        rows = conn.execute(
-            "SELECT date, SUM(amount_cents) AS total FROM transactions WHERE date BETWEEN ? AND ? GROUP BY date",
-            (first.isoformat(), last.isoformat())
-        ).fetchall()
-        day_totals = {r["date"]: r["total"] for r in rows}
-
-        # 3) Add leading blanks to align the 1st under the correct weekday (Mon=0..Sun=6).
-        for _ in range(first.weekday()):
-            grid.add_widget(Widget(size_hint_y=None, height="56dp"))
-
-        # 4) Walk each day, update the running balance, and build a small card.
-        dcur = first
-        while dcur <= last:
-            running += day_totals.get(dcur.isoformat(), 0)
-
-            card = MDCard(
-                orientation="vertical",
-                size_hint_y=None, height="56dp", padding="6dp",
-                radius=[10], md_bg_color=(.96, .96, .96, 1), ripple_behavior=True,
-            )
-            # Day number
-            card.add_widget(MDLabel(
-                text=str(dcur.day),
-                font_style="Caption",
-                theme_text_color="Secondary",
-                size_hint_y=None, height="14dp",
-            ))
-            # Ending balance for this day
-            card.add_widget(MDLabel(
-                text=format_money(running),
-                theme_text_color="Custom",
-                text_color=(0, .6, 0, 1) if running >= 0 else (.8, 0, 0, 1),
-                font_size="12sp",
-            ))
-
-            iso = dcur.isoformat()
-
-            # Make the card tappable to select the day and update the list below.
-            def _on_touch_up(instance, touch, _iso=iso):
-                if instance.collide_point(*touch.pos):
-                    self._selected_iso = _iso
-                    self.refresh_today()
-                return False  # don't swallow other events
+        key = (y, m, self._txn_version)
+        cached = self._month_cache.get(key)
+        if cached is None:
+            cached = month_totals(y, m)
+            self._month_cache[key] = cached
+            if len(self._month_cache) > MONTH_CACHE_SIZE:
+                self._month_cache.popitem(last=False)
+        else:
+            self._month_cache.move_to_end(key)
+        running, day_totals = cached
+
+        # 3) Ending balance for every day of the month in one pass:
+        #    accumulate() runs the prefix sum in C, seeded with `running`.
+        #    ISO keys are formatted from a fixed "YYYY-MM-" prefix rather
+        #    than building a date object per day.
+        prefix = f"{y:04d}-{m:02d}-"
+        isos = [f"{prefix}{d:02d}" for d in range(1, last.day + 1)]
+        endings = list(accumulate(day_totals, initial=running))[1:]
+
+        #    Those are exactly the banner balances for this month's days, so
+        #    seed the banner cache: refresh_today (run after this) and any
+        #    tap within the month then skip balance_on_or_before entirely.
+        self._balance_cache.update(zip(isos, endings))
+
+        # 4) Leading blanks align the 1st under the correct weekday (Mon=0..Sun=6).
+        #    Rows entirely past the last day are taken out of the grid, so it
+        #    has only as many rows (and row gaps) as this month needs.
+        lead = first.weekday()
+        used_cells = (lead + last.day + 6) // 7 * 7
+        grid = self.root.ids.month_grid
 
-            card.bind(on_touch_up=_on_touch_up)
-            grid.add_widget(card)
-            dcur += timedelta(days=1)
+        # 5) Paint the pooled cards from the precomputed balances.
+        for i, card in enumerate(self._day_cards):
+            if i >= used_cells:
+                card.iso = None  # never hit-tested while out of the grid
+                if card.parent is not None:
+                    grid.remove_widget(card)
+                continue
+            if card.parent is None:
+                # Unused cards are always a trailing run, so adding them back
+                # in order appends each one at the end of the grid again.
+                grid.add_widget(card)
+
+            idx = i - lead  # 0-based day of month shown by this card
+            if not 0 <= idx < last.day:
+                card.iso = None
+                card.opacity = 0
+                card.disabled = True
+                continue
+
+            bal = endings[idx]
+            card.iso = isos[idx]
+            card.opacity = 1
+            card.disabled = False
+            card.day_lbl.text = str(idx + 1)
+            card.bal_lbl.text = format_money(bal)
+            card.bal_lbl.text_color = COLOR_POS if bal >= 0 else COLOR_NEG
 
 
 # -------------------------------------------------------------